@@ -1,23 +1,72 @@
 import os
+import httpx
 import redis.asyncio as redis
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared client for outbound HTTP (webhooks, Telex callbacks): keep-alive
+# pooling avoids a fresh TCP/TLS handshake per call. Closed on app shutdown.
+http_client = httpx.AsyncClient(
+    timeout=30.0,
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+    ),
+)
+
+# In-process image cache: serves /image/{id} hits from this worker without
+# a Redis round-trip. Redis stays the source of truth across workers.
+image_cache = TTLCache(maxsize=512, ttl=300)
+
 # Determine whether to use REDIS_URL (Upstash) or local Redis
 REDIS_URL = os.getenv("REDIS_URL")
 
+# Bound the pools explicitly so concurrent requests don't serialize on a
+# single connection; sized above expected in-flight request count.
+MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 64))
+
 if REDIS_URL:
     # Connect using Upstash / cloud Redis URL
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+    _text_pool = redis.ConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        max_connections=MAX_CONNECTIONS,
+        health_check_interval=30,
+        socket_keepalive=True,
+        protocol=3,
+    )
+    # Binary pool for PNG payloads: raw bytes in/out, no base64 inflation
+    _bin_pool = redis.ConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=False,
+        max_connections=MAX_CONNECTIONS,
+        health_check_interval=30,
+        socket_keepalive=True,
+        protocol=3,
+    )
 else:
     # Connect to local Redis for development
-    redis_client = redis.Redis(
+    _local_kwargs = dict(
         host=os.getenv("REDIS_HOST", "localhost"),
         port=int(os.getenv("REDIS_PORT", 6379)),
         db=int(os.getenv("REDIS_DB", 0)),
         password=os.getenv("REDIS_PASSWORD", None),
-        decode_responses=True
+        max_connections=MAX_CONNECTIONS,
+        health_check_interval=30,
+        socket_keepalive=True,
+        protocol=3,
     )
+    _text_pool = redis.ConnectionPool(decode_responses=True, **_local_kwargs)
+    _bin_pool = redis.ConnectionPool(decode_responses=False, **_local_kwargs)
+
+redis_client = redis.Redis(connection_pool=_text_pool)
+redis_bin = redis.Redis(connection_pool=_bin_pool)
 
 
+async def close_redis():
+    """Tear down both pools; called from the app shutdown hook"""
+    await _text_pool.disconnect()
+    await _bin_pool.disconnect()
@@ -1,17 +1,53 @@
+import asyncio
+import hashlib
 import os
-import json
+import orjson
 from typing import Optional
 import httpx
 import re
-from src.dependencies import redis_client
+from src.dependencies import redis_client, redis_bin, image_cache
 from src.utils import HelperFunctions
 import uuid
 import logging
 import html
-import base64
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Read once at import; os.getenv walks os.environ on every call otherwise
+AGENT_URL = os.getenv("AGENT_URL", "")
+
+# How long generated images and their metadata live in Redis (24h)
+CACHE_TTL = 86400
+
+# HTML tag stripper / whitespace collapser for clean_text, compiled
+# once. Two passes on purpose: a one-pass alternation left double spaces
+# around stripped tags, changing the text that feeds the content hash
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+# Splits chained commands so only the latest "create/generate/make ...
+# tweet" segment is parsed
+_SPLIT_TWEET_RE = re.compile(
+    r'(?=(?:create|generate|make)\s+(?:a\s+)?(?:verified\s+)?tweet)',
+    re.IGNORECASE,
+)
+
+# System/agent lines to ignore when hunting for the latest user command
+# (extend if you see other system lines)
+_NOISE_KEYWORDS = (
+    "generating the tweet",
+    "creating the tweet",
+    "creating the verified tweet",
+    "generated twitter screenshot",
+    "generated the tweet",
+)
+
+# One automaton pass over each candidate instead of one scan per keyword
+_NOISE_RE = re.compile(
+    "|".join(re.escape(kw) for kw in _NOISE_KEYWORDS), re.IGNORECASE
+)
+
 from src.schemas import (
     ArtifactPart,
     JSONRPCRequest,
@@ -24,6 +60,92 @@ from src.schemas import (
 )
 
 
+def _is_noise(txt: str) -> bool:
+    # candidates arrive pre-stripped from _clean_text, so no copy here
+    if not txt:
+        return True
+    # also ignore very short fragments and pure punctuation
+    if len(txt) < 6:
+        return True
+    # IGNORECASE search replaces the full lowercase copy
+    if _NOISE_RE.search(txt):
+        return True
+    # ignore code blocks/markup markers: one C-level tuple startswith over
+    # a 4-char lowered prefix instead of two separate checks
+    if txt[:4].lower().startswith(("<pre", "```")):
+        return True
+    return False
+
+
+def _clean_text(raw: str) -> str:
+    if raw is None:
+        return ""
+    # unescape html entities, remove html tags, then normalize whitespace
+    # (incl. &nbsp; left as non-breaking space)
+    no_tags = _HTML_TAG_RE.sub("", html.unescape(raw))
+    return _WS_RE.sub(" ", no_tags).strip()
+
+
+def _collect_candidates(parts, candidates):
+    """Walk an arbitrary dict/list tree and collect cleaned text candidates.
+
+    Iterative DFS over an explicit stack: no per-node Python frame and no
+    recursion limit concerns for deeply nested Telex payloads.
+    """
+    stack = deque([parts])
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        # If node is a list: check each item (reversed keeps document order)
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        # If node is a dict: check possible keys
+        if isinstance(node, dict):
+            kind = node.get("kind")
+            # direct text
+            if kind == "text" and node.get("text"):
+                candidates.append(_clean_text(node.get("text")))
+                continue
+            # sometimes Telex wraps text directly in 'text' on a dict without kind
+            if "text" in node and not kind:
+                candidates.append(_clean_text(node.get("text")))
+            # push nested containers in reverse visit order: the LIFO pops
+            # 'data' first, matching the recursive data-then-parts walk
+            # (sometimes there is a nested 'parts' structure inside data dict)
+            if node.get("parts") is not None:
+                stack.append(node.get("parts"))
+            if node.get("data") is not None:
+                stack.append(node.get("data"))
+            continue
+        # other types (string) -> consider directly
+        if isinstance(node, str):
+            candidates.append(_clean_text(node))
+
+
+def _latest_text(parts):
+    """
+    Extract candidate texts (in order encountered), clean them, ignore
+    noise, and return the last meaningful candidate.
+    """
+    candidates = []
+    _collect_candidates(parts, candidates)
+
+    # debug log of candidates: %r of the full list is expensive, so only
+    # format it when DEBUG is actually enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("latest_text candidates (count=%d): %r", len(candidates), candidates)
+
+    # choose the last non-noise candidate
+    for cand in reversed(candidates):
+        if cand and not _is_noise(cand):
+            logger.debug("latest_text selected: %r", cand)
+            return cand
+    logger.debug("latest_text found no non-noise candidate.")
+    return ""
+
+
 class Handler:
    
     @staticmethod
@@ -33,102 +155,10 @@ class Handler:
         message = params.message
 
         # Generate context/task IDs
-        context_id = message.contextId or str(uuid.uuid4())
-        task_id = message.taskId or str(uuid.uuid4())
-
-        # ---- Robust latest_text() with debug logging ----
-        def latest_text(parts):
-            """
-            Recursively extract candidate texts (in order encountered), clean them,
-            ignore noise, and return the last meaningful candidate.
-            """
-            def is_noise(txt: str) -> bool:
-                if not txt:
-                    return True
-                lower = txt.lower().strip()
-                # noise patterns (extend if you see other system lines)
-                noise_keywords = [
-                    "generating the tweet",
-                    "generating the tweet for",
-                    "creating the tweet",
-                    "creating the verified tweet",
-                    "generated twitter screenshot",
-                    "generated the tweet",
-                    "creating the tweet now",
-                    "creating the tweet for",
-                ]
-                # also ignore very short fragments and pure punctuation
-                if len(lower) < 6:
-                    return True
-                for kw in noise_keywords:
-                    if kw in lower:
-                        return True
-                # ignore code blocks/markup markers
-                if lower.startswith("<pre") or lower.startswith("```"):
-                    return True
-                return False
-
-            def clean_text(raw: str) -> str:
-                if raw is None:
-                    return ""
-                # unescape html entities, remove html tags, normalize whitespace
-                un = html.unescape(raw)
-                no_tags = re.sub(r"<[^>]+>", "", un)
-                # remove leftover &nbsp; etc which html.unescape may leave as non-breaking space
-                cleaned = re.sub(r"\s+", " ", no_tags).strip()
-                return cleaned
-
-            candidates = []
-
-            def extract(node):
-                """Walk node which may be dict, list, or value and collect text candidates."""
-                if node is None:
-                    return
-                # If node is a list: check each item
-                if isinstance(node, list):
-                    for item in node:
-                        extract(item)
-                    return
-                # If node is a dict: check possible keys
-                if isinstance(node, dict):
-                    kind = node.get("kind")
-                    # direct text
-                    if kind == "text" and node.get("text"):
-                        txt = clean_text(node.get("text"))
-                        candidates.append(txt)
-                        return
-                    # sometimes Telex wraps text directly in 'text' on a dict without kind
-                    if "text" in node and not node.get("kind"):
-                        txt = clean_text(node.get("text"))
-                        candidates.append(txt)
-                    # nested 'data' may be list or dict
-                    if node.get("data") is not None:
-                        extract(node.get("data"))
-                    # sometimes there is a nested 'parts' structure inside data dict
-                    if node.get("parts") is not None:
-                        extract(node.get("parts"))
-                    return
-                # other types (string) -> consider directly
-                if isinstance(node, str):
-                    txt = clean_text(node)
-                    candidates.append(txt)
-                    return
-
-            # start extraction from top-level parts
-            extract(parts)
-
-            # debug log of candidates (won't break production)
-            logger.info(f"latest_text candidates (count={len(candidates)}): {candidates!r}")
-
-            # choose the last non-noise candidate
-            for cand in reversed(candidates):
-                if cand and not is_noise(cand):
-                    logger.info(f"latest_text selected: {cand!r}")
-                    return cand
-            logger.info("latest_text found no non-noise candidate.")
-            return ""
-
-            # ---- Extract latest command ----
+        context_id = message.contextId or uuid.uuid4().hex
+        task_id = message.taskId or uuid.uuid4().hex
+
+        # ---- Extract latest command ----
         # Convert message.parts to dict if they're Pydantic models
         parts_val = None
         if hasattr(message, "parts") and message.parts:
@@ -153,21 +183,65 @@ class Handler:
             else:
                 parts_val = []
 
-        logger.info(f"🔍 DEBUG parts_val type: {type(parts_val)}, length: {len(parts_val) if isinstance(parts_val, list) else 'N/A'}, value preview: {parts_val[:1] if isinstance(parts_val, list) and len(parts_val) > 0 else parts_val}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "parts_val type: %s, length: %s, value preview: %r",
+                type(parts_val),
+                len(parts_val) if isinstance(parts_val, list) else "N/A",
+                parts_val[:1] if isinstance(parts_val, list) and len(parts_val) > 0 else parts_val,
+            )
+
+        # Nothing to extract at all: skip the Redis lookups, the tree walk
+        # and the regex splitting and answer immediately
+        if not parts_val:
+            logger.warning("Empty parts; missing tweet content. Returning error.")
+            return JSONRPCResponse(
+                id=request.id,
+                error={
+                    "code": -32602,
+                    "message": "Missing tweet content. Try: 'create a tweet for john saying hello world'"
+                }
+            )
 
-        latest_user_text = latest_text(parts_val) or ""
-        logger.info(f"🧩 Extracted latest_user_text (raw): {latest_user_text!r}")
+        # Telex resends the whole conversation each turn; remember how far we
+        # scanned last time so long contexts stay O(new items) per turn.
+        start_idx = 0
+        if isinstance(parts_val, list) and len(parts_val) > 1:
+            try:
+                cached_idx = await redis_client.get(f"ctx:{context_id}:last_idx")
+                if cached_idx is not None:
+                    start_idx = int(cached_idx)
+            except Exception as e:
+                logger.warning(f"last_idx lookup failed: {str(e)}")
+            if not 0 <= start_idx < len(parts_val):
+                start_idx = 0  # history truncated/reset; rescan everything
+
+        latest_user_text = _latest_text(
+            parts_val[start_idx:] if start_idx else parts_val
+        ) or ""
+        if not latest_user_text and start_idx:
+            # Nothing usable past the cached index; fall back to a full scan
+            latest_user_text = _latest_text(parts_val) or ""
+
+        if isinstance(parts_val, list) and parts_val:
+            try:
+                await redis_client.setex(
+                    f"ctx:{context_id}:last_idx", 3600, len(parts_val) - 1
+                )
+            except Exception as e:
+                logger.warning(f"last_idx store failed: {str(e)}")
+
+        logger.debug("Extracted latest_user_text (raw): %r", latest_user_text)
 
         tweet_data = {}
         if latest_user_text:
             # Split by known tweet creation keywords (keep latest)
-            split_pattern = r'(?=(?:create|generate|make)\s+(?:a\s+)?(?:verified\s+)?tweet)'
-            segments = re.split(split_pattern, latest_user_text, flags=re.IGNORECASE)
+            segments = _SPLIT_TWEET_RE.split(latest_user_text)
             segments = [s.strip() for s in segments if s.strip()]
-            logger.info(f"Split segments from latest_user_text: {segments!r}")
+            logger.debug("Split segments from latest_user_text: %r", segments)
             if segments:
                 parsed_data = HelperFunctions.parse_tweet_request(segments[-1])
-                logger.info(f"parse_tweet_request returned: {parsed_data!r}")
+                logger.debug("parse_tweet_request returned: %r", parsed_data)
                 if parsed_data and "tweet_text" in parsed_data:
                     tweet_data = parsed_data
 
@@ -193,64 +267,77 @@ class Handler:
         views = tweet_data.get("views", 0)
         timestamp = tweet_data.get("timestamp", None)
 
-        # ---- Generate screenshot ----
-        filepath = HelperFunctions.generate_tweet_screenshot(
-            username=username,
-            display_name=display_name,
-            tweet_text=tweet_text,
-            verified=verified,
-            likes=likes,
-            retweets=retweets,
-            replies=replies,
-            views=views,
-            timestamp=timestamp
-        )
-
-        image_id = os.path.basename(filepath)
-        image_url = f"{os.getenv('AGENT_URL')}/image/{image_id}"
-
-        # ---- Store image in Redis ----
-        try:
-            with open(filepath, "rb") as img_file:
-                image_bytes = img_file.read()
-                image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-
-            await redis_client.setex(f"image:{image_id}", 86400, image_base64)
-            logger.info(f"Stored image in Redis: image:{image_id}")
+        # ---- Content-addressed image id ----
+        # Identical tweet_data hashes to the same id, so a repeat request
+        # reuses the stored PNG and skips the render entirely.
+        key_material = orjson.dumps(tweet_data, option=orjson.OPT_SORT_KEYS)
+        content_hash = hashlib.blake2b(key_material, digest_size=16).hexdigest()
+        image_id = f"tweet_{content_hash}.png"
+        image_url = f"{AGENT_URL}/image/{image_id}"
+
+        if image_id in image_cache or await redis_bin.exists(f"tweet:{image_id}"):
+            logger.info("Reusing cached screenshot: tweet:%s", image_id)
+        else:
+            # ---- Generate screenshot (in memory, no temp file) ----
+            # Pillow rendering is blocking CPU work; keep it off the event loop
+            png_bytes = await asyncio.to_thread(
+                HelperFunctions.generate_tweet_screenshot_bytes,
+                username=username,
+                display_name=display_name,
+                tweet_text=tweet_text,
+                verified=verified,
+                likes=likes,
+                retweets=retweets,
+                replies=replies,
+                views=views,
+                timestamp=timestamp
+            )
 
-            os.remove(filepath)
-            logger.info(f"Deleted temp file: {filepath}")
+            # ---- Store image + metadata in Redis (single round-trip) ----
+            try:
+                # One hash per tweet (fields: png, meta) with a single TTL;
+                # both commands ship in one pipeline write, no MULTI/EXEC.
+                # Raw PNG bytes go straight in via the binary client.
+                async with redis_bin.pipeline(transaction=False) as pipe:
+                    pipe.hset(
+                        f"tweet:{image_id}",
+                        mapping={"png": png_bytes, "meta": key_material},
+                    )
+                    pipe.expire(f"tweet:{image_id}", CACHE_TTL)
+                    await pipe.execute()
+                logger.info("Stored image in Redis: tweet:%s", image_id)
 
-        except Exception as e:
-            logger.error(f"Failed to store image in Redis: {str(e)}")
+                # Same-worker fetches of the fresh image skip Redis entirely
+                image_cache[image_id] = png_bytes
 
-        # ---- Store tweet metadata ----
-        await redis_client.setex(
-            f"tweet:{image_id}",
-            86400,
-            json.dumps(tweet_data)
-        )
+            except Exception as e:
+                logger.error(f"Failed to store image in Redis: {str(e)}")
 
         # ---- Create A2A response ----
-        response_message = A2AMessage(
+        # Same text goes into both the message part and the artifact part
+        body_text = f"Generated Twitter screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+
+        # These objects are built from trusted internal values, so
+        # model_construct skips a full validation pass per object
+        response_message = A2AMessage.model_construct(
             role="agent",
             parts=[
-                MessagePart(
+                MessagePart.model_construct(
                     kind="text",
-                    text=f"Generated Twitter screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+                    text=body_text
                 )
             ],
             taskId=task_id,
             contextId=context_id
         )
 
-        artifact = Artifact(
+        artifact = Artifact.model_construct(
             name=f"twitter_screenshot_{username}.png",
             mimeType="image/png",
             parts=[
-                ArtifactPart(
+                ArtifactPart.model_construct(
                     kind="text",
-                    text=f"Generated Twitter screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+                    text=body_text
                 )
             ]
         )
@@ -274,32 +361,75 @@ class Handler:
         params = request.params
         messages = params.messages
         
-        context_id = params.contextId or str(uuid.uuid4())
-        task_id = params.taskId or str(uuid.uuid4())
+        context_id = params.contextId or uuid.uuid4().hex
+        task_id = params.taskId or uuid.uuid4().hex
         
         all_artifacts = []
         all_history = []
         last_message = None
-        
-        for message in messages:
+
+        def _parse_one(message):
+            """Parse one message into (image_id, image_url, key_material,
+            tweet_data, username) or None when it carries no tweet content."""
             tweet_data = {}
-            
+
             for part in message.parts:
                 if part.kind == "text":
                     parsed_data = HelperFunctions.parse_tweet_request(part.text)
                     tweet_data.update(parsed_data)
                 elif part.kind == "data" and part.data:
                     tweet_data.update(part.data)
-            
+
             if "tweet_text" not in tweet_data:
-                continue
-            
+                return None
+
+            # Content-addressed id (same scheme as message/send)
+            key_material = orjson.dumps(tweet_data, option=orjson.OPT_SORT_KEYS)
+            content_hash = hashlib.blake2b(key_material, digest_size=16).hexdigest()
+            image_id = f"tweet_{content_hash}.png"
+            image_url = f"{AGENT_URL}/image/{image_id}"
             username = tweet_data.get("username", "user")
-            display_name = tweet_data.get("display_name", username.title())
-            
-            filepath = HelperFunctions.generate_tweet_screenshot(
+
+            return image_id, image_url, key_material, tweet_data, username
+
+        # Hash everything first, then dedupe: identical messages collapse
+        # onto one image id BEFORE any rendering starts, so duplicates
+        # within the batch render once.
+        parsed = [_parse_one(m) for m in messages]
+
+        unique = {}
+        for entry in parsed:
+            if entry is not None and entry[0] not in unique:
+                unique[entry[0]] = entry
+
+        # One pipelined EXISTS round-trip for every id the local cache misses
+        to_check = [iid for iid in unique if iid not in image_cache]
+        missing = set()
+        if to_check:
+            try:
+                async with redis_bin.pipeline(transaction=False) as pipe:
+                    for iid in to_check:
+                        pipe.exists(f"tweet:{iid}")
+                    flags = await pipe.execute()
+                missing = {iid for iid, flag in zip(to_check, flags) if not flag}
+            except Exception as e:
+                logger.error(f"Batch EXISTS check failed: {str(e)}")
+                missing = set(to_check)
+
+        for iid in unique:
+            if iid not in missing:
+                logger.info("Reusing cached screenshot: tweet:%s", iid)
+
+        async def _render_one(entry):
+            """Render one unique screenshot off the event loop."""
+            image_id, _, _, tweet_data, username = entry
+
+            # Pillow rendering is blocking CPU work; run it in a worker
+            # thread so the batch renders concurrently.
+            png_bytes = await asyncio.to_thread(
+                HelperFunctions.generate_tweet_screenshot_bytes,
                 username=username,
-                display_name=display_name,
+                display_name=tweet_data.get("display_name", username.title()),
                 tweet_text=tweet_data["tweet_text"],
                 verified=tweet_data.get("verified", False),
                 likes=tweet_data.get("likes", 0),
@@ -308,39 +438,69 @@ class Handler:
                 views=tweet_data.get("views", 0),
                 timestamp=tweet_data.get("timestamp", None)
             )
-            
-            image_id = os.path.basename(filepath)
-            image_url = f"{os.getenv('AGENT_URL')}/image/{image_id}"
-            
-            # TEXT ONLY artifact
-            artifact = Artifact(
+
+            return image_id, png_bytes
+
+        rendered = await asyncio.gather(*[_render_one(unique[iid]) for iid in missing])
+
+        # One pipeline for the whole batch: every newly rendered image is
+        # queued here and flushed in a single round-trip after the loop.
+        pipe = redis_bin.pipeline(transaction=False)
+
+        for image_id, png_bytes in rendered:
+            pipe.hset(
+                f"tweet:{image_id}",
+                mapping={"png": png_bytes, "meta": unique[image_id][2]},
+            )
+            pipe.expire(f"tweet:{image_id}", CACHE_TTL)
+
+            # Same-worker fetches of the fresh image skip Redis entirely
+            image_cache[image_id] = png_bytes
+
+        for entry in parsed:
+            if entry is None:
+                continue
+
+            image_id, image_url, key_material, tweet_data, username = entry
+
+            # Same text goes into both the artifact part and the message part
+            body_text = f"Generated screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+
+            # TEXT ONLY artifact (internal values: skip validation)
+            artifact = Artifact.model_construct(
                 name=f"twitter_screenshot_{username}.png",
                 mimeType="image/png",
                 parts=[
-                    ArtifactPart(
+                    ArtifactPart.model_construct(
                         kind="text",
-                        text=f"Generated screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+                        text=body_text
                     )
                 ]
             )
             all_artifacts.append(artifact)
-            
+
             # TEXT ONLY message
-            response_message = A2AMessage(
+            response_message = A2AMessage.model_construct(
                 role="agent",
                 parts=[
-                    MessagePart(
+                    MessagePart.model_construct(
                         kind="text",
-                        text=f"Generated screenshot for @{username}\n\n![Tweet Screenshot]({image_url})\n\nView image: {image_url}"
+                        text=body_text
                     )
                 ],
                 taskId=task_id,
                 contextId=context_id
             )
-            
+
             last_message = response_message
             all_history.append(response_message)
-        
+
+        # Flush every queued store in one round-trip (N images -> 1 RTT).
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to store batch images in Redis: {str(e)}")
+
         task_result = TaskResult(
             id=task_id,
             contextId=context_id,
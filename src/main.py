@@ -1,6 +1,10 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+import asyncio
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from src.router import agent_router as router
 
@@ -30,7 +34,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info("Starting Twitter Screenshot Generator Agent")
 
-app = FastAPI(title="Twitter Screenshot Generator Agent")
+app = FastAPI(
+    title="Twitter Screenshot Generator Agent",
+    default_response_class=ORJSONResponse,
+)
 
 
 # Ensure output directory exists
@@ -41,17 +48,59 @@ app.include_router(router)
 logger.info("Router included successfully")
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """Turn malformed A2A payloads into JSON-RPC errors (status 200).
+
+    Keeps the debug logging off the fast path: valid requests pay nothing,
+    invalid ones land here with the full validation detail.
+    """
+    body = getattr(exc, "body", None)
+    errors = exc.errors()
+    logger.error(f"Request validation failed: {errors!r}")
+    logger.error(f"Request body structure: {body!r}")
+
+    rpc_id = body.get("id", "unknown") if isinstance(body, dict) else "unknown"
+    # JSON-RPC distinguishes unparseable bodies (-32700) from well-formed
+    # requests with bad params (-32602)
+    if any(e.get("type") == "json_invalid" for e in errors):
+        error = {"code": -32700, "message": f"Parse error: {errors}"}
+    else:
+        error = {"code": -32602, "message": f"Invalid params: {errors}"}
+    return ORJSONResponse(
+        status_code=200,
+        content={"jsonrpc": "2.0", "id": rpc_id, "error": error},
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
+    # Screenshot rendering runs through asyncio.to_thread; size the default
+    # executor to the core count so batch renders use the whole machine
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=os.cpu_count() or 1))
     logger.info("FastAPI application started successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    from src.dependencies import close_redis, http_client
+
+    await http_client.aclose()
+    await close_redis()
     logger.info("FastAPI application shutting down")
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # uvloop event loop + httptools HTTP parser: both C implementations,
+    # a sizeable win for small JSON-RPC handlers where parsing dominates
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+    )
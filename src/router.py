@@ -1,20 +1,19 @@
-from fastapi import FastAPI, Depends, HTTPException, APIRouter, Query, status, Request as request
+from fastapi import FastAPI, Depends, HTTPException, APIRouter, Body, Query, status, Request as request
 import os
 from fastapi.responses import FileResponse, JSONResponse, Response
 from src.handlers import Handler
-import json
-import base64
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Import redis client
-from src.dependencies import redis_client  # Adjust this import based on where your redis_client is
+# Import redis clients
+from src.dependencies import redis_client, redis_bin, image_cache  # Adjust this import based on where your redis_client is
 
 # Import A2A models
 from src.schemas import (
     JSONRPCRequest,
+    JSONRPCRequestUnion,
     JSONRPCResponse,
     TaskResult,
     TaskStatus,
@@ -25,49 +24,66 @@ from src.schemas import (
 
 agent_router = APIRouter()
 
+# Env vars never change after startup; build the health payload once
+# instead of two os.getenv lookups and a fresh dict per request
+_HEALTH_RESPONSE = {
+    "agent_name": os.getenv("AGENT_NAME"),
+    "agent_id": os.getenv("AGENT_ID"),
+    "status": "online",
+    "protocol": "a2a-jsonrpc-2.0",
+}
+
 
 @agent_router.get("/")
 async def root():
     """Health check"""
     logger.info("Health check endpoint called")
-    
-    response = {
-        "agent_name": os.getenv("AGENT_NAME"),
-        "agent_id": os.getenv("AGENT_ID"),
-        "status": "online",
-        "protocol": "a2a-jsonrpc-2.0",
-    }
-    
-    logger.info(f"Health check response: {response}")
-    return response
+    return _HEALTH_RESPONSE
 
 
 @agent_router.get("/image/{image_id}")
-async def get_image(image_id: str):
+async def get_image(image_id: str, raw_request: request):
     """Serve generated tweet images from Redis"""
-    
+
     try:
         logger.info(f"Fetching image: {image_id}")
-        
-        # Get image data from Redis
-        image_data = await redis_client.get(f"image:{image_id}")
-        
-        if not image_data:
+
+        # Content-addressed ids never change, so the id itself is the ETag:
+        # a revalidation can 304 without touching the cache or Redis
+        etag = f'"{image_id}"'
+        if raw_request.headers.get("if-none-match") == etag:
+            # RFC 9110: a 304 repeats the validator/caching headers so
+            # caches can refresh their stored metadata
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": "public, max-age=86400, immutable",
+                },
+            )
+
+        # Local in-process cache first; fall back to Redis on a miss
+        # (e.g. another worker rendered it, or this one restarted)
+        image_bytes = image_cache.get(image_id)
+        if image_bytes is None:
+            # Get raw PNG bytes from Redis (png field of the per-tweet hash)
+            image_bytes = await redis_bin.hget(f"tweet:{image_id}", "png")
+
+        if not image_bytes:
             logger.error(f"Image not found in Redis: {image_id}")
             return JSONResponse(
                 status_code=404,
                 content={"error": "Image not found"}
             )
-        
-        # Decode base64 image data
-        image_bytes = base64.b64decode(image_data)
-        logger.info(f"Image found and decoded: {image_id}")
+
+        logger.info(f"Image found: {image_id}")
         
         return Response(
             content=image_bytes,
             media_type="image/png",
             headers={
-                "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+                "ETag": etag,
+                "Cache-Control": "public, max-age=86400, immutable",  # Cache for 24 hours
                 "Content-Disposition": f"inline; filename={image_id}"
             }
         )
@@ -81,73 +97,37 @@ async def get_image(image_id: str):
 
 
 @agent_router.post("/a2a/twitter-screenshot")
-async def a2a_endpoint(raw_request: request):
-    """Main A2A JSON-RPC 2.0 endpoint - with debug logging"""
-    
-    # Get raw body
-    try:
-        body = await raw_request.body()
-        logger.info(f"Raw body bytes: {body}")
-        
-        # Parse JSON
-        json_body = json.loads(body)
-        logger.info(f"Parsed JSON: {json.dumps(json_body, indent=2)}")
-        
-    except Exception as e:
-        logger.error(f"Failed to read/parse body: {str(e)}", exc_info=True)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "jsonrpc": "2.0",
-                "id": "unknown",
-                "error": {"code": -32700, "message": f"Parse error: {str(e)}"}
-            }
-        )
-    
-    # Try to validate with Pydantic
-    try:
-        request = JSONRPCRequest(**json_body)
-        logger.info("Pydantic validation SUCCESS")
-        
-        # Handle message/send method
-        if request.method == "message/send":
-            logger.info("Handling message/send")
-            result = await Handler.handle_message_send(request)
-            return JSONResponse(status_code=200, content=result.model_dump())
-
-        # Handle execute method
-        elif request.method == "execute":
-            logger.info("Handling execute")
-            result = await Handler.handle_execute(request)
-            return JSONResponse(status_code=200, content=result.model_dump())
-
-        else:
-            logger.warning(f"Method not found: {request.method}")
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "jsonrpc": "2.0",
-                    "id": request.id,
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {request.method}"
-                    }
-                }
-            )
+async def a2a_endpoint(rpc_request: JSONRPCRequestUnion = Body(discriminator="method")):
+    """Main A2A JSON-RPC 2.0 endpoint"""
 
-    except Exception as e:
-        logger.error(f"Pydantic validation FAILED: {str(e)}", exc_info=True)
-        logger.error(f"Request body structure: {json.dumps(json_body, indent=2)}")
-        
-        # Return a valid error response
+    # FastAPI has already parsed and validated the body into JSONRPCRequest;
+    # malformed payloads are turned into JSON-RPC errors by the
+    # RequestValidationError handler in main.py.
+
+    # Handle message/send method
+    if rpc_request.method == "message/send":
+        logger.info("Handling message/send")
+        result = await Handler.handle_message_send(rpc_request)
+        # model_dump_json serializes once through pydantic-core; no
+        # intermediate dict + stdlib json re-serialization
+        return Response(content=result.model_dump_json(), media_type="application/json")
+
+    # Handle execute method
+    elif rpc_request.method == "execute":
+        logger.info("Handling execute")
+        result = await Handler.handle_execute(rpc_request)
+        return Response(content=result.model_dump_json(), media_type="application/json")
+
+    else:
+        logger.warning(f"Method not found: {rpc_request.method}")
         return JSONResponse(
             status_code=200,
             content={
                 "jsonrpc": "2.0",
-                "id": json_body.get("id", "unknown"),
+                "id": rpc_request.id,
                 "error": {
-                    "code": -32602,
-                    "message": f"Invalid params: {str(e)}"
+                    "code": -32601,
+                    "message": f"Method not found: {rpc_request.method}"
                 }
             }
-        )
\ No newline at end of file
+        )
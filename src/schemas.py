@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Literal, Optional, List, Dict, Any, Union
+from typing import Annotated, Literal, Optional, List, Dict, Any, Union
 from datetime import datetime
 from uuid import uuid4
 
@@ -73,8 +73,23 @@ class JSONRPCResponse(BaseModel):
     result: Optional[TaskResult] = None
     error: Optional[Dict[str, Any]] = None
 
-class JSONRPCRequest(BaseModel):
+class MessageSendRequest(BaseModel):
     jsonrpc: Literal["2.0"]
     id: str
-    method: Literal["message/send", "execute"]
-    params: Union[MessageParams, ExecuteParams]  
+    method: Literal["message/send"]
+    params: MessageParams
+
+
+class ExecuteRequest(BaseModel):
+    jsonrpc: Literal["2.0"]
+    id: str
+    method: Literal["execute"]
+    params: ExecuteParams
+
+
+# Discriminating on method lets Pydantic pick the right params model in
+# one lookup instead of trying MessageParams first on every execute call.
+# The endpoint passes the discriminator via Body() (FastAPI rejects Field
+# metadata combined with a Body default), so the bare union is public too.
+JSONRPCRequestUnion = Union[MessageSendRequest, ExecuteRequest]
+JSONRPCRequest = Annotated[JSONRPCRequestUnion, Field(discriminator="method")]
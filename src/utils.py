@@ -1,33 +1,195 @@
-from fastapi.responses import FileResponse
 from PIL import Image, ImageDraw, ImageFont
+import io
 import uuid
 import os
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
-import json
 import re
 
+# Precompiled patterns for parse_tweet_request, hoisted so the hot path
+# never pays the re-cache lookup (this runs per text part per request)
+# One finditer pass picks up the verified flag and all four engagement
+# counters together instead of separate scans per feature
+_SCAN_RE = re.compile(
+    r'(?P<verified>verified)'
+    r'|(?P<num>\d+(?:\.\d+)?(?:k|m)?)\s*(?P<kind>likes?|retweets?|repl(?:y|ies)|views?)',
+    re.IGNORECASE,
+)
+_METRICS_STRIP_RE = re.compile(r'(?:with\s+)?(?:and\s+)?\d+(?:\.\d+)?(?:k|m)?\s*(?:likes?|retweets?|repl(?:y|ies)|views?)', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_SAYING_FOR_RE = re.compile(r'saying\s+(.+?)\s+for\s+@?(\w+)', re.IGNORECASE)
+_SAYING_USERNAME_RE = re.compile(r'saying\s+(.+?)\s+username\s+@?(\w+)', re.IGNORECASE)
+_FOR_SAYING_RE = re.compile(r'for\s+@?(\w+)\s+saying\s+(.+?)(?:\s*$)', re.IGNORECASE)
+_USERNAME_SAYING_RE = re.compile(r'username\s+@?(\w+)\s+saying\s+(.+?)(?:\s*$)', re.IGNORECASE)
+_SAYING_RE = re.compile(r'saying\s+(.+?)(?:\s*$)', re.IGNORECASE)
+_FOR_TEXT_RE = re.compile(r'for\s+@?(\w+)\s+(.+?)(?:\s*$)', re.IGNORECASE)
+_COMMAND_FALLBACK_RE = re.compile(r'(?:create|generate|make)\s+(?:a\s+)?(?:verified\s+)?(?:tweet\s+)?(.+?)(?:\s*$)', re.IGNORECASE)
+
+# parse_number: one match + one table lookup instead of repeated
+# contains/replace passes over the string
+_NUM_RE = re.compile(r'([\d.]+)\s*([km]?)', re.IGNORECASE)
+_NUM_MUL = {"": 1, "k": 1_000, "m": 1_000_000}
+
+
+def _load_icon(path: str, size: tuple):
+    """Decode + resize an icon once at import; None if the file is missing"""
+    try:
+        return Image.open(path).convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+    except Exception:
+        return None
+
+
+def _load_action_icon(path: str) -> "Image.Image":
+    """Load an action icon once; a missing file yields a pre-drawn
+    placeholder-circle tile so the render loop never branches or re-stats
+    the filesystem per request"""
+    icon = _load_icon(path, (20, 20))
+    if icon is None:
+        icon = Image.new("RGBA", (20, 20), (0, 0, 0, 0))
+        ImageDraw.Draw(icon).ellipse([0, 0, 19, 19], outline=(83, 100, 113), width=2)
+    return icon
+
+
+# Pre-resized RGBA assets shared by every render: saves a disk read, a
+# PNG decode and a LANCZOS resample per icon per screenshot
+_ICON_CACHE = {
+    "reply": _load_action_icon("icons/reply.png"),
+    "retweet": _load_action_icon("icons/retweet.png"),
+    "like": _load_action_icon("icons/like.png"),
+    "views": _load_action_icon("icons/views.png"),
+}
+_BADGE = _load_icon("icons/twitter_verified_badge.png", (16, 16))
+
+# Counters under 1000 render as-is; a precomputed table makes that common
+# case a plain tuple index
+_SMALL_NUMS = tuple(str(i) for i in range(1000))
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _default_timestamp() -> str:
+    """Format 'h:MM AM · Mon D, YYYY' without strftime's locale machinery
+    or the lstrip/replace cleanup passes it forced"""
+    now = datetime.now()
+    hour = now.hour % 12 or 12
+    meridiem = "AM" if now.hour < 12 else "PM"
+    return f"{hour}:{now.minute:02d} {meridiem} · {_MONTHS[now.month - 1]} {now.day}, {now.year}"
+
+
+# Twitter palette, shared by every render
+_TEXT_COLOR = (15, 20, 25)
+_GRAY = (83, 100, 113)
+_BLUE = (29, 155, 240)
+_BORDER = (239, 243, 244)
+_PROFILE_BG = (207, 217, 222)
+
+
+@lru_cache(maxsize=None)
+def _get_font(path: str, size: int):
+    """Load a font once per (path, size); FreeType face parsing is the
+    dominant cost of rendering when repeated per request"""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def _avatar(initials: str):
+    """48x48 profile tile (circle + centered initials), cached per initials.
+
+    The avatar is a pure function of the initials, so repeated users cost
+    one blit; even the first render draws on a tiny tile instead of the
+    full canvas.
+    """
+    size = 48
+    tile = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(tile)
+
+    draw.ellipse(
+        [0, 0, size, size],
+        fill=_PROFILE_BG,
+        outline=_BORDER,
+        width=1,
+    )
+
+    if initials:
+        initial_font = _get_font("fonts/Inter-Bold.ttf", 20)
+        bbox = draw.textbbox((0, 0), initials, font=initial_font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        draw.text(
+            ((size - text_width) // 2, (size - text_height) // 2 - 2),
+            initials,
+            font=initial_font,
+            fill=(255, 255, 255),
+        )
+
+    return tile
+
+
+@lru_cache(maxsize=256)
+def _action_strip(replies: int, retweets: int, likes: int, views: int):
+    """Pre-composited action row (icons + counts) for one stats tuple.
+
+    Rendering the row on its own small RGBA strip turns four pastes and
+    four text draws on the big canvas into a single cached blit; repeated
+    stat combinations reuse the composited pixels outright.
+    """
+    strip_w = 598 - 2 * 16
+    strip = Image.new("RGBA", (strip_w, 24), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(strip)
+    spacing = strip_w // 4
+    number_font = _get_font("fonts/Inter-Regular.ttf", 13)
+
+    counts = (("reply", replies), ("retweet", retweets), ("like", likes), ("views", views))
+    for i, (name, value) in enumerate(counts):
+        x = i * spacing + 5
+        # Always an image: missing files were replaced by placeholder
+        # tiles at import, so no branch here
+        icon = _ICON_CACHE[name]
+        strip.paste(icon, (x, 0), icon)
+
+        if value > 0:  # Only show if there's a value
+            draw.text(
+                (x + 26, 2),
+                HelperFunctions.format_number(value),
+                font=number_font,
+                fill=_GRAY,
+            )
+
+    return strip
+
+
+# The Follow button renders the same string in the same font every time;
+# measure it once
+_FOLLOW_BBOX = _get_font("fonts/Inter-Bold.ttf", 14).getbbox("Follow")
+_FOLLOW_TEXT_W = _FOLLOW_BBOX[2] - _FOLLOW_BBOX[0]
+_FOLLOW_TEXT_H = _FOLLOW_BBOX[3] - _FOLLOW_BBOX[1]
+
+
 class HelperFunctions:
     # Helper Functions
     def load_font(size: int, bold: bool = False):
-        """Load font from fonts directory"""
+        """Load font from fonts directory (cached)"""
         font_file = "Inter-Bold.ttf" if bold else "Inter-Regular.ttf"
-        font_path = os.path.join("fonts", font_file)
-
-        try:
-            return ImageFont.truetype(font_path, size)
-        except:
-            return ImageFont.load_default()
+        return _get_font(os.path.join("fonts", font_file), size)
 
+    @lru_cache(maxsize=4096)
     def format_number(num: int) -> str:
-        """Format numbers like Twitter (1.2K, 3.4M, etc.)"""
+        """Format numbers like Twitter (1.2K, 3.4M, etc.); cached, the
+        same handful of counters repeats across requests"""
+        if 0 <= num < 1000:
+            return _SMALL_NUMS[num]
         if num >= 1_000_000:
             return f"{num / 1_000_000:.1f}M"
         elif num >= 1_000:
             return f"{num / 1_000:.1f}K"
         return str(num)
 
-    def generate_tweet_screenshot(
+    def generate_tweet_screenshot_bytes(
         username: str,
         display_name: str,
         tweet_text: str,
@@ -38,38 +200,69 @@ class HelperFunctions:
         views: int = 0,
         timestamp: Optional[str] = None,
         profile_image_url: Optional[str] = None,
-    ) -> str:
-        """Generate a realistic Twitter screenshot"""
+    ) -> bytes:
+        """Generate a realistic Twitter screenshot and return the PNG bytes"""
 
         # Image dimensions
         width = 598
         padding = 16
 
-        # Create base image
-        img = Image.new("RGB", (width, 500), color=(255, 255, 255))
-        draw = ImageDraw.Draw(img)
+        # Load fonts (cached after the first request)
+        name_font = _get_font("fonts/Inter-Bold.ttf", 15)
+        username_font = _get_font("fonts/Inter-Regular.ttf", 15)
+        text_font = _get_font("fonts/Inter-Regular.ttf", 15)
+        stats_font = _get_font("fonts/Inter-Bold.ttf", 14)
+        stats_label_font = _get_font("fonts/Inter-Regular.ttf", 14)
+        timestamp_font = _get_font("fonts/Inter-Regular.ttf", 15)
+        button_font = _get_font("fonts/Inter-Bold.ttf", 14)
+
+        # Word wrap: measure each word once and keep a running line width
+        # instead of re-shaping the whole accumulated line per word
+        lines = []
+        max_width = width - (2 * padding)
 
-        # Load fonts
-        try:
-            name_font = ImageFont.truetype("fonts/Inter-Bold.ttf", 15)
-            username_font = ImageFont.truetype("fonts/Inter-Regular.ttf", 15)
-            text_font = ImageFont.truetype("fonts/Inter-Regular.ttf", 15)
-            stats_font = ImageFont.truetype("fonts/Inter-Bold.ttf", 14)
-            stats_label_font = ImageFont.truetype("fonts/Inter-Regular.ttf", 14)
-            timestamp_font = ImageFont.truetype("fonts/Inter-Regular.ttf", 15)
-            button_font = ImageFont.truetype("fonts/Inter-Bold.ttf", 14)
-        except:
-            name_font = username_font = text_font = stats_font = timestamp_font = (
-                ImageFont.load_default()
-            )
-            stats_label_font = button_font = ImageFont.load_default()
+        space_w = text_font.getlength(" ")
+        cur_str = ""
+        cur_w = 0.0
+        for word in tweet_text.split():
+            word_w = text_font.getlength(word)
+            test_w = cur_w + (space_w if cur_str else 0) + word_w
+            if test_w <= max_width:
+                cur_str = f"{cur_str} {word}" if cur_str else word
+                cur_w = test_w
+            else:
+                if cur_str:
+                    lines.append(cur_str)
+                cur_str = word
+                cur_w = word_w
 
-        # Twitter colors
-        text_color = (15, 20, 25)
-        gray_color = (83, 100, 113)
-        blue_color = (29, 155, 240)
-        border_color = (239, 243, 244)
-        profile_bg = (207, 217, 222)
+        if cur_str:
+            lines.append(cur_str)
+
+        line_height = 20
+
+        # The line count fixes the layout, so the canvas can be allocated at
+        # its final height up front: no oversized buffer, no crop copy, and
+        # the PNG encoder compresses only real scanlines
+        has_stats = retweets > 0 or likes > 0 or replies > 0
+        final_y = padding + 48 + 12 + len(lines) * line_height + 12 + 28 + 12 + 35
+        if has_stats:
+            # stats row + its separator
+            final_y += 12 + 28
+
+        # Create base image; RGBA plus a single decoration overlay keeps
+        # alpha blending on Pillow's one-shot alpha_composite path instead
+        # of per-paste mask conversions against an RGB base
+        img = Image.new("RGBA", (width, final_y), color=(255, 255, 255, 255))
+        overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        # Twitter colors (module-level palette)
+        text_color = _TEXT_COLOR
+        gray_color = _GRAY
+        blue_color = _BLUE
+        border_color = _BORDER
+        profile_bg = _PROFILE_BG
 
         y_position = padding
 
@@ -78,35 +271,12 @@ class HelperFunctions:
         profile_y = y_position
         profile_size = 48
 
-        # Profile circle
-        draw.ellipse(
-            [profile_x, profile_y, profile_x + profile_size, profile_y + profile_size],
-            fill=profile_bg,
-            outline=border_color,
-            width=1,
-        )
-
-        # Add initials
+        # Profile circle + initials, pre-rendered per initials string
+        initials = ""
         if display_name:
             initials = "".join([word[0] for word in display_name.split()[:2]]).upper()
-            try:
-                initial_font = ImageFont.truetype("fonts/Inter-Bold.ttf", 20)
-            except:
-                initial_font = name_font
-
-            bbox = draw.textbbox((0, 0), initials, font=initial_font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            initial_x = profile_x + (profile_size - text_width) // 2
-            initial_y = profile_y + (profile_size - text_height) // 2 - 2
-
-            draw.text(
-                (initial_x, initial_y),
-                initials,
-                font=initial_font,
-                fill=(255, 255, 255),
-            )
+        avatar = _avatar(initials)
+        overlay.paste(avatar, (profile_x, profile_y), avatar)
 
         # === NAME AND VERIFICATION (EVEN SMALLER BADGE) ===
         name_x = profile_x + profile_size + 12
@@ -116,15 +286,14 @@ class HelperFunctions:
 
         # SMALLER verified badge (reduced to 14px)
         if verified:
-            name_bbox = draw.textbbox((name_x, name_y), display_name, font=name_font)
-            name_width = name_bbox[2] - name_bbox[0]
+            # only the horizontal advance matters here; getlength skips the
+            # vertical metrics and bbox allocation textbbox pays for
+            name_width = int(name_font.getlength(display_name))
             badge_x = name_x + name_width + 6
             badge_y = name_y + 2
 
-            badge_img = Image.open("icons/twitter_verified_badge.png").convert("RGBA")
-            badge_img = badge_img.resize((16, 16), Image.Resampling.LANCZOS)  # 👈 scaled down
-
-            img.paste(badge_img, (int(badge_x), int(badge_y)), badge_img)
+            if _BADGE is not None:
+                overlay.paste(_BADGE, (int(badge_x), int(badge_y)), _BADGE)
 
 
         # === FOLLOW BUTTON (Top Right) ===
@@ -145,19 +314,15 @@ class HelperFunctions:
             fill=blue_color,
         )
 
-        # Follow button text
-        follow_text = "Follow"
-        follow_bbox = draw.textbbox((0, 0), follow_text, font=button_font)
-        follow_text_width = follow_bbox[2] - follow_bbox[0]
-        follow_text_height = follow_bbox[3] - follow_bbox[1]
-        follow_text_x = follow_button_x + (follow_button_width - follow_text_width) // 2
+        # Follow button text (bbox precomputed at module level)
+        follow_text_x = follow_button_x + (follow_button_width - _FOLLOW_TEXT_W) // 2
         follow_text_y = (
-            follow_button_y + (follow_button_height - follow_text_height) // 2 - 2
+            follow_button_y + (follow_button_height - _FOLLOW_TEXT_H) // 2 - 2
         )
 
         draw.text(
             (follow_text_x, follow_text_y),
-            follow_text,
+            "Follow",
             font=button_font,
             fill=(255, 255, 255),
         )
@@ -171,38 +336,21 @@ class HelperFunctions:
         # === TWEET TEXT ===
         text_y = profile_y + profile_size + 12
 
-        # Word wrap
-        words = tweet_text.split()
-        lines = []
-        current_line = []
-        max_width = width - (2 * padding)
-
-        for word in words:
-            test_line = " ".join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=text_font)
-            if bbox[2] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        line_height = 20
-        for line in lines:
-            draw.text((padding, text_y), line, font=text_font, fill=text_color)
-            text_y += line_height
+        if lines:
+            # One shaping/raster call for the whole block instead of one
+            # draw.text per line; spacing keeps the 20px line advance
+            draw.multiline_text(
+                (padding, text_y),
+                "\n".join(lines),
+                font=text_font,
+                fill=text_color,
+                spacing=line_height - getattr(text_font, "size", 15),
+            )
+        text_y += len(lines) * line_height
 
         # === TIMESTAMP ===
         text_y += 12
-        timestamp_text = (
-            timestamp
-            if timestamp
-            else datetime.now().strftime("%I:%M %p · %b %d, %Y").lstrip("0").replace(" 0", " ")
-
-        )
+        timestamp_text = timestamp if timestamp else _default_timestamp()
         draw.text(
             (padding, text_y), timestamp_text, font=timestamp_font, fill=gray_color
         )
@@ -213,120 +361,72 @@ class HelperFunctions:
             [(padding, text_y), (width - padding, text_y)], fill=border_color, width=1
         )
 
-        # === ENGAGEMENT STATS ===
-        stats_y = text_y + 12
-        stats_x = padding
+        # === ENGAGEMENT STATS (skipped entirely for bare tweets) ===
+        if has_stats:
+            stats_y = text_y + 12
+            stats_x = padding
 
-        stats_data = []
-        if retweets > 0:
-            stats_data.append((HelperFunctions.format_number(retweets), "Retweets"))
-        if likes > 0:
-            stats_data.append((HelperFunctions.format_number(likes), "Likes"))
-        if replies > 0:
-            stats_data.append((HelperFunctions.format_number(replies), "Replies"))
+            stats_data = []
+            if retweets > 0:
+                stats_data.append((HelperFunctions.format_number(retweets), "Retweets"))
+            if likes > 0:
+                stats_data.append((HelperFunctions.format_number(likes), "Likes"))
+            if replies > 0:
+                stats_data.append((HelperFunctions.format_number(replies), "Replies"))
 
-        for number, label in stats_data:
-            draw.text((stats_x, stats_y), number, font=stats_font, fill=text_color)
+            for number, label in stats_data:
+                draw.text((stats_x, stats_y), number, font=stats_font, fill=text_color)
 
-            num_bbox = draw.textbbox((stats_x, stats_y), number, font=stats_font)
-            num_width = num_bbox[2] - num_bbox[0]
+                num_width = int(stats_font.getlength(number))
 
-            draw.text(
-                (stats_x + num_width + 4, stats_y),
-                label,
-                font=stats_label_font,
-                fill=gray_color,
+                draw.text(
+                    (stats_x + num_width + 4, stats_y),
+                    label,
+                    font=stats_label_font,
+                    fill=gray_color,
+                )
+
+                label_width = int(stats_label_font.getlength(label))
+
+                stats_x += num_width + label_width + 20
+
+            # === SEPARATOR LINE ===
+            stats_y += 28
+            draw.line(
+                [(padding, stats_y), (width - padding, stats_y)],
+                fill=border_color,
+                width=1,
             )
+            button_y = stats_y + 12
+        else:
+            button_y = text_y + 12
 
-            label_bbox = draw.textbbox((0, 0), label, font=stats_label_font)
-            label_width = label_bbox[2] - label_bbox[0]
+        # === ACTION BUTTONS (cached pre-composited strip) ===
+        strip = _action_strip(replies, retweets, likes, views)
+        overlay.paste(strip, (padding, button_y), strip)
 
-            stats_x += num_width + label_width + 20
+        # Blend all decorations in one composite, then back to RGB for the
+        # smaller 3-channel PNG
+        img = Image.alpha_composite(img, overlay).convert("RGB")
 
-        # === SEPARATOR LINE ===
-        stats_y += 28
-        draw.line(
-            [(padding, stats_y), (width - padding, stats_y)], fill=border_color, width=1
-        )
+        # Encode in memory; the PNG never needs to touch the disk
+        buf = io.BytesIO()
+        # compress_level=1: the card is mostly flat color, so zlib's filter
+        # search (optimize=True) barely shrinks it while dominating encode
+        # time; quality= is a JPEG knob that PNG ignores anyway
+        img.save(buf, format="PNG", compress_level=1)
 
-        # === ACTION BUTTONS (USING LOCAL ICON IMAGES) ===
-        button_y = stats_y + 12
-        button_spacing = (width - 2 * padding) // 4
-        icon_size = 20
-
-        # Load and paste icons from local folder
-        icon_paths = {
-            "reply": "icons/reply.png",
-            "retweet": "icons/retweet.png",
-            "like": "icons/like.png",
-            "views": "icons/views.png",
-        }
-
-        icon_positions = [
-            padding + 5,
-            padding + button_spacing + 5,
-            padding + 2 * button_spacing + 5,
-            padding + 3 * button_spacing + 5,
-        ]
-
-        icon_names = ["reply", "retweet", "like", "views"]
-
-        # Stats values for each icon
-        icon_stats = {
-            "reply": replies,
-            "retweet": retweets,
-            "like": likes,
-            "views": views,
-        }
-
-        # Font for numbers next to icons
-        try:
-            icon_number_font = ImageFont.truetype("fonts/Inter-Regular.ttf", 13)
-        except:
-            icon_number_font = stats_label_font
-
-        for i, icon_name in enumerate(icon_names):
-            try:
-                icon_path = icon_paths[icon_name]
-                icon = Image.open(icon_path).convert("RGBA")
-                # Resize icon to desired size
-                icon = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
-
-                # Paste icon with transparency
-                img.paste(icon, (icon_positions[i], button_y), icon)
-            except Exception as e:
-                # Fallback: draw a simple placeholder circle if icon not found
-                draw.ellipse(
-                    [
-                        icon_positions[i],
-                        button_y,
-                        icon_positions[i] + icon_size,
-                        button_y + icon_size,
-                    ],
-                    outline=gray_color,
-                    width=2,
-                )
+        return buf.getvalue()
 
-            # Draw the number next to the icon
-            stat_value = icon_stats.get(icon_name, 0)
-            if stat_value > 0:  # Only show if there's a value
-                formatted_number = HelperFunctions.format_number(stat_value)
-                number_x = icon_positions[i] + icon_size + 6  # 6px gap after icon
-                number_y = button_y + 2  # Align vertically with icon
-                draw.text(
-                    (number_x, number_y),
-                    formatted_number,
-                    font=icon_number_font,
-                    fill=gray_color,
-                )
 
-        # Crop to actual content height
-        final_y = button_y + 35
-        img = img.crop((0, 0, width, final_y))
-        # Save
+    def generate_tweet_screenshot(**kwargs) -> str:
+        """Generate a screenshot and write it under output/ (debug helper)"""
+        png_bytes = HelperFunctions.generate_tweet_screenshot_bytes(**kwargs)
+
         filename = f"tweet_{uuid.uuid4().hex}.png"
         filepath = os.path.join("output", filename)
-        img.save(filepath, format="PNG", quality=95, optimize=True)
+        with open(filepath, "wb") as f:
+            f.write(png_bytes)
 
         return filepath
 
@@ -342,20 +442,16 @@ class HelperFunctions:
         - "for bob saying hello with 100 likes and 50 retweets"
         """
         result = {}
-        text_lower = text.lower().strip()
-        
-        # Check for verification
-        if "verified" in text_lower:
-            result["verified"] = True
-        
-        # Extract engagement metrics FIRST and remove them from text for cleaner parsing
-        metrics_pattern = r'(\d+(?:\.\d+)?(?:k|m)?)\s*(likes?|retweets?|repl(?:y|ies)|views?)'
-        metrics = re.findall(metrics_pattern, text, re.IGNORECASE)
-        
-        for value, metric_type in metrics:
-            metric_lower = metric_type.lower()
-            parsed_value = HelperFunctions.parse_number(value)
-            
+
+        # One scan collects the verified flag and every engagement metric
+        for m in _SCAN_RE.finditer(text):
+            if m.group("verified"):
+                result["verified"] = True
+                continue
+
+            metric_lower = m.group("kind").lower()
+            parsed_value = HelperFunctions.parse_number(m.group("num"))
+
             if 'like' in metric_lower:
                 result["likes"] = parsed_value
             elif 'retweet' in metric_lower:
@@ -366,13 +462,12 @@ class HelperFunctions:
                 result["views"] = parsed_value
         
         # Remove metric phrases to clean the text for username/content extraction
-        cleaned_text = re.sub(r'(?:with\s+)?(?:and\s+)?\d+(?:\.\d+)?(?:k|m)?\s*(?:likes?|retweets?|repl(?:y|ies)|views?)', '', text, flags=re.IGNORECASE)
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-        
+        cleaned_text = _METRICS_STRIP_RE.sub('', text)
+        cleaned_text = _WS_RE.sub(' ', cleaned_text).strip()
+
         # Pattern 1: "saying <tweet_text> for <username>"
-        pattern1 = r'saying\s+(.+?)\s+for\s+@?(\w+)'
-        match = re.search(pattern1, cleaned_text, re.IGNORECASE)
-        
+        match = _SAYING_FOR_RE.search(cleaned_text)
+
         if match:
             result["tweet_text"] = match.group(1).strip()
             username = match.group(2).strip()
@@ -381,9 +476,8 @@ class HelperFunctions:
             return result
         
         # Pattern 2: "saying <tweet_text> username <username>"
-        pattern2 = r'saying\s+(.+?)\s+username\s+@?(\w+)'
-        match = re.search(pattern2, cleaned_text, re.IGNORECASE)
-        
+        match = _SAYING_USERNAME_RE.search(cleaned_text)
+
         if match:
             result["tweet_text"] = match.group(1).strip()
             username = match.group(2).strip()
@@ -392,9 +486,8 @@ class HelperFunctions:
             return result
         
         # Pattern 3: "for <username> saying <tweet_text>"
-        pattern3 = r'for\s+@?(\w+)\s+saying\s+(.+?)(?:\s*$)'
-        match = re.search(pattern3, cleaned_text, re.IGNORECASE)
-        
+        match = _FOR_SAYING_RE.search(cleaned_text)
+
         if match:
             username = match.group(1).strip()
             result["username"] = username.lower()
@@ -403,9 +496,8 @@ class HelperFunctions:
             return result
         
         # Pattern 4: "username <username> saying <tweet_text>"
-        pattern4 = r'username\s+@?(\w+)\s+saying\s+(.+?)(?:\s*$)'
-        match = re.search(pattern4, cleaned_text, re.IGNORECASE)
-        
+        match = _USERNAME_SAYING_RE.search(cleaned_text)
+
         if match:
             username = match.group(1).strip()
             result["username"] = username.lower()
@@ -414,17 +506,15 @@ class HelperFunctions:
             return result
         
         # Pattern 5: Just "saying <tweet_text>" without username
-        pattern5 = r'saying\s+(.+?)(?:\s*$)'
-        match = re.search(pattern5, cleaned_text, re.IGNORECASE)
-        
+        match = _SAYING_RE.search(cleaned_text)
+
         if match:
             result["tweet_text"] = match.group(1).strip()
             return result
         
         # Pattern 6: "for <username> <tweet_text>" (no "saying" keyword)
-        pattern6 = r'for\s+@?(\w+)\s+(.+?)(?:\s*$)'
-        match = re.search(pattern6, cleaned_text, re.IGNORECASE)
-        
+        match = _FOR_TEXT_RE.search(cleaned_text)
+
         if match:
             username = match.group(1).strip()
             result["username"] = username.lower()
@@ -442,9 +532,8 @@ class HelperFunctions:
             return result
         
         # Pattern 8: Fallback - extract everything after command words as tweet text
-        fallback_pattern = r'(?:create|generate|make)\s+(?:a\s+)?(?:verified\s+)?(?:tweet\s+)?(.+?)(?:\s*$)'
-        match = re.search(fallback_pattern, cleaned_text, re.IGNORECASE)
-        
+        match = _COMMAND_FALLBACK_RE.search(cleaned_text)
+
         if match:
             result["tweet_text"] = match.group(1).strip()
             return result
@@ -462,11 +551,7 @@ class HelperFunctions:
         - '1.5k' -> 1500
         - '2m' -> 2000000
         """
-        num_str = num_str.lower().strip()
-        
-        if 'k' in num_str:
-            return int(float(num_str.replace('k', '')) * 1000)
-        elif 'm' in num_str:
-            return int(float(num_str.replace('m', '')) * 1000000)
-        else:
-            return int(num_str)
\ No newline at end of file
+        match = _NUM_RE.match(num_str.strip())
+        if not match:
+            return 0
+        return int(float(match.group(1)) * _NUM_MUL[match.group(2).lower()])
\ No newline at end of file